@@ -10,7 +10,16 @@ from __future__ import annotations
 
 import argparse
 import datetime as dt
+import math
+import mmap
+import os
 import re
+import shutil
+import string
+from bisect import bisect_right
+from contextlib import nullcontext
+from functools import lru_cache
+from itertools import chain, islice
 from pathlib import Path
 from typing import Any
 
@@ -27,6 +36,38 @@ CANONICAL_ORDER = [
     "Ludhiana (West)",
 ]
 
+CANONICAL_SLOT = {name: i for i, name in enumerate(CANONICAL_ORDER)}
+
+
+# Leading rows searched for the report date before falling back to the header.
+REPORT_DATE_ROWS = 5
+
+
+_NAME_KEEP = frozenset(string.ascii_lowercase + string.digits)
+_NAME_DROP = str.maketrans("", "", "".join(chr(i) for i in range(128) if chr(i) not in _NAME_KEEP))
+_DATE_RE = re.compile(r"(\d{1,2})[-/](\d{1,2})[-/](\d{2,4})")
+# A header row mentions all of these, possibly split across lines within a cell.
+# Anchored so the lookaheads run once from the start rather than at every offset.
+_HEADER_RE = re.compile(
+    r"\A(?=.*(?:sub\s+district|tehsil))(?=.*uploaded\s+village)(?=.*uploaded\s+plots)(?=.*surveyed)(?=.*approved)",
+    re.DOTALL,
+)
+
+
+# Ordinal suffix for every value of n % 100.
+_ORDINAL_SUFFIX = tuple(
+    "th" if 10 <= i <= 20 else {1: "st", 2: "nd", 3: "rd"}.get(i % 10, "th") for i in range(100)
+)
+
+
+# Lower bounds (inclusive) of the medium and high bands for progress bars and
+# badges; see _survey_band for the one exclusive bound.
+_SURVEY_THRESHOLDS = (20.0, 25.0)
+_APPROVAL_BAR_THRESHOLDS = (10.0, 15.0)
+_APPROVAL_BADGE_THRESHOLDS = (10.0, 20.0)
+_BAR_CLASSES = ("low", "medium", "high")
+_BADGE_CLASSES = ("danger", "warning", "success")
+
 
 DISPLAY_NAME_MAP = {
     "raikot": "Raikot",
@@ -45,10 +86,15 @@ def normalize_text(value: Any) -> str:
     return " ".join(str(value).replace("\n", " ").split()).strip().lower()
 
 
+@lru_cache(maxsize=128)
 def normalize_name(value: str) -> str:
-    return re.sub(r"[^a-z0-9]", "", value.lower())
+    lowered = value.lower()
+    if lowered.isascii():
+        return lowered.translate(_NAME_DROP)
+    return "".join(c for c in lowered if c in _NAME_KEEP)
 
 
+@lru_cache(maxsize=128)
 def display_name(raw_name: str) -> str:
     return DISPLAY_NAME_MAP.get(normalize_name(raw_name), raw_name.strip())
 
@@ -68,10 +114,17 @@ def parse_number(value: Any) -> float:
 
 
 def to_int(value: Any) -> int:
+    # Exact type checks: bool is an int subclass but must still become 0/1.
+    if type(value) is int:
+        return value
+    if type(value) is float:
+        return int(round(value))
     return int(round(parse_number(value)))
 
 
 def to_percent(value: Any) -> float:
+    if type(value) is float:
+        return round(value, 2)
     return round(parse_number(value), 2)
 
 
@@ -81,15 +134,10 @@ def format_indian_number(value: int | float) -> str:
     s = str(abs(n))
     if len(s) <= 3:
         return sign + s
-    tail = s[-3:]
-    head = s[:-3]
-    parts = []
-    while len(head) > 2:
-        parts.append(head[-2:])
-        head = head[:-2]
-    if head:
-        parts.append(head)
-    return sign + ",".join(reversed(parts)) + "," + tail
+    # Leading group is one or two digits so the rest split evenly into pairs.
+    head_len = len(s) - 3
+    first = 2 - (head_len & 1)
+    return sign + ",".join([s[:first], *[s[i : i + 2] for i in range(first, head_len, 2)], s[-3:]])
 
 
 def format_signed_indian_number(value: int | float) -> str:
@@ -99,15 +147,11 @@ def format_signed_indian_number(value: int | float) -> str:
 
 
 def ordinal(n: int) -> str:
-    if 10 <= n % 100 <= 20:
-        suffix = "th"
-    else:
-        suffix = {1: "st", 2: "nd", 3: "rd"}.get(n % 10, "th")
-    return f"{n}{suffix}"
+    return f"{n}{_ORDINAL_SUFFIX[n % 100]}"
 
 
 def parse_date_tokens(text: str) -> dt.date | None:
-    match = re.search(r"(\d{1,2})[-/](\d{1,2})[-/](\d{2,4})", text)
+    match = _DATE_RE.search(text)
     if not match:
         return None
     day = int(match.group(1))
@@ -133,53 +177,39 @@ def format_daily_chart_label(date_obj: dt.date) -> str:
     return f"{ordinal(date_obj.day)} {date_obj.strftime('%b')}"
 
 
+def _band(thresholds: tuple[float, float], percent: float) -> int:
+    # NaN compares false against every threshold, so it belongs in the lowest band.
+    if math.isnan(percent):
+        return 0
+    return bisect_right(thresholds, percent)
+
+
+def _survey_band(percent: float) -> int:
+    # Survey completion must strictly exceed 25% to count as high.
+    if percent == _SURVEY_THRESHOLDS[1]:
+        return 1
+    return _band(_SURVEY_THRESHOLDS, percent)
+
+
 def survey_bar_class(percent: float) -> str:
-    if percent > 25:
-        return "high"
-    if percent >= 20:
-        return "medium"
-    return "low"
+    return _BAR_CLASSES[_survey_band(percent)]
 
 
 def approval_bar_class(percent: float) -> str:
-    if percent >= 15:
-        return "high"
-    if percent >= 10:
-        return "medium"
-    return "low"
+    return _BAR_CLASSES[_band(_APPROVAL_BAR_THRESHOLDS, percent)]
 
 
 def survey_badge_class(percent: float) -> str:
-    if percent > 25:
-        return "success"
-    if percent >= 20:
-        return "warning"
-    return "danger"
+    return _BADGE_CLASSES[_survey_band(percent)]
 
 
 def approval_badge_class(percent: float) -> str:
-    if percent >= 20:
-        return "success"
-    if percent >= 10:
-        return "warning"
-    return "danger"
+    return _BADGE_CLASSES[_band(_APPROVAL_BADGE_THRESHOLDS, percent)]
 
 
-def detect_header_row(rows: list[tuple[Any, ...]]) -> int:
-    for i, row in enumerate(rows):
-        cells = [normalize_text(cell) for cell in row if normalize_text(cell)]
-        if not cells:
-            continue
-        joined = " | ".join(cells)
-        if (
-            ("sub district" in joined or "tehsil" in joined)
-            and "uploaded village" in joined
-            and "uploaded plots" in joined
-            and "surveyed" in joined
-            and "approved" in joined
-        ):
-            return i
-    raise ValueError("Could not detect header row in Excel sheet.")
+def is_header_row(row: tuple[Any, ...]) -> bool:
+    joined = " | ".join(str(cell).lower() for cell in row if cell is not None)
+    return _HEADER_RE.match(joined) is not None
 
 
 def map_columns(header_row: tuple[Any, ...]) -> dict[str, int]:
@@ -233,7 +263,7 @@ def map_columns(header_row: tuple[Any, ...]) -> dict[str, int]:
 
 
 def extract_report_date(rows: list[tuple[Any, ...]], header_row: tuple[Any, ...], col_map: dict[str, int]) -> dt.date:
-    for row in rows[:5]:
+    for row in rows[:REPORT_DATE_ROWS]:
         for cell in row:
             if isinstance(cell, dt.datetime):
                 return cell.date()
@@ -252,64 +282,128 @@ def extract_report_date(rows: list[tuple[Any, ...]], header_row: tuple[Any, ...]
 
 
 def read_excel_data(excel_path: Path) -> dict[str, Any]:
-    wb = load_workbook(excel_path, data_only=True)
-    ws = wb.active
-    rows = list(ws.iter_rows(values_only=True))
-
-    header_idx = detect_header_row(rows)
-    header_row = rows[header_idx]
-    col = map_columns(header_row)
-    report_date = extract_report_date(rows, header_row, col)
-
-    subdivisions: list[dict[str, Any]] = []
-    totals: dict[str, Any] | None = None
-
-    for row in rows[header_idx + 1 :]:
-        name_cell = row[col["name"]] if col["name"] < len(row) else None
-        if name_cell is None or str(name_cell).strip() == "":
-            continue
-        raw_name = str(name_cell).strip()
-        key = normalize_name(raw_name)
-
-        row_data = {
-            "name": display_name(raw_name),
-            "uploaded_villages": to_int(row[col["uploaded_villages"]]),
-            "uploaded_plots": to_int(row[col["uploaded_plots"]]),
-            "daily_target": to_int(row[col["daily_target"]]),
-            "surveyed_today": to_int(row[col["surveyed_today"]]),
-            "total_surveyed": to_int(row[col["total_surveyed"]]),
-            "survey_percent": to_percent(row[col["survey_percent"]]),
-            "approved": to_int(row[col["approved"]]),
-            "approval_percent": to_percent(row[col["approval_percent"]]),
-            "total_surveyors": to_int(row[col["total_surveyors"]]),
-            "in_field": to_int(row[col["in_field"]]),
-        }
-
-        if key == "total":
-            totals = row_data
+    wb = load_workbook(excel_path, data_only=True, read_only=True)
+    try:
+        ws = wb.active
+        # Read-only mode trusts the sheet's <dimension> element, which some exporters
+        # omit or write too small; recompute it from the rows actually present.
+        ws.reset_dimensions()
+        row_iter = ws.iter_rows(values_only=True)
+
+        # Rows are parsed as they stream in; only the first REPORT_DATE_ROWS
+        # rows are kept, for extract_report_date.
+        lead_rows: list[tuple[Any, ...]] = []
+        for row in row_iter:
+            if len(lead_rows) < REPORT_DATE_ROWS:
+                lead_rows.append(row)
+            if is_header_row(row):
+                header_row = row
+                break
         else:
-            subdivisions.append(row_data)
-
+            raise ValueError("Could not detect header row in Excel sheet.")
+        # With the header near the top, the leading rows include some data rows.
+        first_data_rows = list(islice(row_iter, REPORT_DATE_ROWS - len(lead_rows)))
+        lead_rows += first_data_rows
+
+        col = map_columns(header_row)
+        report_date = extract_report_date(lead_rows, header_row, col)
+        (
+            i_name,
+            i_uv,
+            i_up,
+            i_dt,
+            i_st,
+            i_ts,
+            i_sp,
+            i_ap,
+            i_appct,
+            i_tsv,
+            i_if,
+        ) = (
+            col["name"],
+            col["uploaded_villages"],
+            col["uploaded_plots"],
+            col["daily_target"],
+            col["surveyed_today"],
+            col["total_surveyed"],
+            col["survey_percent"],
+            col["approved"],
+            col["approval_percent"],
+            col["total_surveyors"],
+            col["in_field"],
+        )
+        row_len_needed = max(i_name, i_uv, i_up, i_dt, i_st, i_ts, i_sp, i_ap, i_appct, i_tsv, i_if) + 1
+
+        ordered: list[dict[str, Any] | None] = [None] * len(CANONICAL_ORDER)
+        extras: list[dict[str, Any]] = []
+        totals: dict[str, Any] | None = None
+
+        for row in chain(first_data_rows, row_iter):
+            if i_name >= len(row):
+                continue
+            if len(row) < row_len_needed:
+                # Without a trusted dimension, rows stop at their last non-empty
+                # cell; blank trailing columns read as None.
+                row = row + (None,) * (row_len_needed - len(row))
+            name_cell = row[i_name]
+            if name_cell is None:
+                continue
+            raw_name = (name_cell if isinstance(name_cell, str) else str(name_cell)).strip()
+            if not raw_name:
+                continue
+            key = normalize_name(raw_name)
+
+            row_data = {
+                "name": display_name(raw_name),
+                "uploaded_villages": to_int(row[i_uv]),
+                "uploaded_plots": to_int(row[i_up]),
+                "daily_target": to_int(row[i_dt]),
+                "surveyed_today": to_int(row[i_st]),
+                "total_surveyed": to_int(row[i_ts]),
+                "survey_percent": to_percent(row[i_sp]),
+                "approved": to_int(row[i_ap]),
+                "approval_percent": to_percent(row[i_appct]),
+                "total_surveyors": to_int(row[i_tsv]),
+                "in_field": to_int(row[i_if]),
+            }
+
+            if key == "total":
+                totals = row_data
+                continue
+            slot = CANONICAL_SLOT.get(row_data["name"])
+            if slot is not None:
+                ordered[slot] = row_data
+            else:
+                extras.append(row_data)
+    finally:
+        wb.close()
+
+    subdivisions = [row for row in ordered if row is not None]
+    subdivisions += sorted(extras, key=lambda x: x["name"])
     if not subdivisions:
         raise ValueError("No subdivision rows found in Excel data.")
 
-    by_name = {row["name"]: row for row in subdivisions}
-    ordered = [by_name[name] for name in CANONICAL_ORDER if name in by_name]
-    extras = [row for row in subdivisions if row["name"] not in CANONICAL_ORDER]
-    extras.sort(key=lambda x: x["name"])
-    subdivisions = ordered + extras
-
     if totals is None:
+        uv = up = dt_ = st = ts = ap = tsv = inf = 0
+        for r in subdivisions:
+            uv += r["uploaded_villages"]
+            up += r["uploaded_plots"]
+            dt_ += r["daily_target"]
+            st += r["surveyed_today"]
+            ts += r["total_surveyed"]
+            ap += r["approved"]
+            tsv += r["total_surveyors"]
+            inf += r["in_field"]
         totals = {
             "name": "Total",
-            "uploaded_villages": sum(r["uploaded_villages"] for r in subdivisions),
-            "uploaded_plots": sum(r["uploaded_plots"] for r in subdivisions),
-            "daily_target": sum(r["daily_target"] for r in subdivisions),
-            "surveyed_today": sum(r["surveyed_today"] for r in subdivisions),
-            "total_surveyed": sum(r["total_surveyed"] for r in subdivisions),
-            "approved": sum(r["approved"] for r in subdivisions),
-            "total_surveyors": sum(r["total_surveyors"] for r in subdivisions),
-            "in_field": sum(r["in_field"] for r in subdivisions),
+            "uploaded_villages": uv,
+            "uploaded_plots": up,
+            "daily_target": dt_,
+            "surveyed_today": st,
+            "total_surveyed": ts,
+            "approved": ap,
+            "total_surveyors": tsv,
+            "in_field": inf,
         }
         totals["survey_percent"] = round((totals["total_surveyed"] / totals["uploaded_plots"]) * 100, 2) if totals["uploaded_plots"] else 0.0
         totals["approval_percent"] = round((totals["approved"] / totals["total_surveyed"]) * 100, 2) if totals["total_surveyed"] else 0.0
@@ -354,11 +448,8 @@ def build_stats_html(totals: dict[str, Any]) -> str:
 
 
 def build_subdivision_cards_html(rows: list[dict[str, Any]]) -> str:
-    blocks: list[str] = ['    <div class="subdivision-grid">']
-    for row in rows:
-        survey_class = survey_bar_class(row["survey_percent"])
-        approval_class = approval_bar_class(row["approval_percent"])
-        blocks.append(
+    cards = "\n".join(
+        [
             f"""        <div class="subdivision-card">
             <h3>{row["name"]}</h3>
             <div class="progress-section">
@@ -367,7 +458,7 @@ def build_subdivision_cards_html(rows: list[dict[str, Any]]) -> str:
                     <span><strong>{row["survey_percent"]:.2f}%</strong></span>
                 </div>
                 <div class="progress-bar">
-                    <div class="progress-fill {survey_class}" style="width: {row["survey_percent"]:.2f}%;"></div>
+                    <div class="progress-fill {survey_bar_class(row["survey_percent"])}" style="width: {row["survey_percent"]:.2f}%;"></div>
                 </div>
             </div>
             <div class="progress-section">
@@ -376,7 +467,7 @@ def build_subdivision_cards_html(rows: list[dict[str, Any]]) -> str:
                     <span><strong>{row["approval_percent"]:.2f}%</strong></span>
                 </div>
                 <div class="progress-bar">
-                    <div class="progress-fill {approval_class}" style="width: {row["approval_percent"]:.2f}%;"></div>
+                    <div class="progress-fill {approval_bar_class(row["approval_percent"])}" style="width: {row["approval_percent"]:.2f}%;"></div>
                 </div>
             </div>
             <div class="detail-grid">
@@ -402,34 +493,30 @@ def build_subdivision_cards_html(rows: list[dict[str, Any]]) -> str:
                 </div>
             </div>
         </div>"""
-        )
-    blocks.append("    </div>")
-    return "\n".join(blocks)
+            for row in rows
+        ]
+    )
+    return f'    <div class="subdivision-grid">\n{cards}\n    </div>'
 
 
 def build_table_body_html(rows: list[dict[str, Any]], totals: dict[str, Any]) -> str:
-    lines = ["            <tbody>"]
-    for row in rows:
-        survey_badge = survey_badge_class(row["survey_percent"])
-        approval_badge = approval_badge_class(row["approval_percent"])
-        lines.append(
-            f"""                <tr>
+    lines = [
+        f"""                <tr>
                     <td><strong>{row["name"]}</strong></td>
                     <td>{row["uploaded_villages"]}</td>
                     <td>{format_indian_number(row["uploaded_plots"])}</td>
                     <td>{format_indian_number(row["daily_target"])}</td>
                     <td>{format_indian_number(row["surveyed_today"])}</td>
                     <td>{format_indian_number(row["total_surveyed"])}</td>
-                    <td><span class="badge {survey_badge}">{row["survey_percent"]:.2f}%</span></td>
+                    <td><span class="badge {survey_badge_class(row["survey_percent"])}">{row["survey_percent"]:.2f}%</span></td>
                     <td>{format_indian_number(row["approved"])}</td>
-                    <td><span class="badge {approval_badge}">{row["approval_percent"]:.2f}%</span></td>
+                    <td><span class="badge {approval_badge_class(row["approval_percent"])}">{row["approval_percent"]:.2f}%</span></td>
                     <td>{row["total_surveyors"]}</td>
                     <td>{row["in_field"]}</td>
                 </tr>"""
-        )
-
-    lines.append(
-        f"""                <tr>
+        for row in rows
+    ]
+    total_line = f"""                <tr>
                     <td><strong>Total</strong></td>
                     <td><strong>{totals["uploaded_villages"]}</strong></td>
                     <td><strong>{format_indian_number(totals["uploaded_plots"])}</strong></td>
@@ -442,31 +529,86 @@ def build_table_body_html(rows: list[dict[str, Any]], totals: dict[str, Any]) ->
                     <td><strong>{totals["total_surveyors"]}</strong></td>
                     <td><strong>{totals["in_field"]}</strong></td>
                 </tr>"""
-    )
-    lines.append("            </tbody>")
-    return "\n".join(lines)
-
-
-def replace_between(text: str, start_marker: str, end_marker: str, replacement: str) -> str:
-    start_idx = text.find(start_marker)
-    if start_idx == -1:
-        raise ValueError(f"Start marker not found: {start_marker}")
-    end_idx = text.find(end_marker, start_idx)
-    if end_idx == -1:
-        raise ValueError(f"End marker not found after start marker: {end_marker}")
-    return text[:start_idx] + replacement + text[end_idx:]
-
-
-def replace_array_const(text: str, const_name: str, values_js: str) -> str:
-    pattern = re.compile(rf"const {re.escape(const_name)} = \[[^\]]*];")
-    if not pattern.search(text):
-        raise ValueError(f"JS array constant not found: {const_name}")
-    return pattern.sub(f"const {const_name} = [{values_js}];", text, count=1)
-
-
-def update_html(index_path: Path, data: dict[str, Any]) -> None:
-    html = index_path.read_text(encoding="utf-8")
-
+    return "\n".join(["            <tbody>", *lines, total_line, "            </tbody>"])
+
+
+_JS_ARRAY_CONSTS = (
+    "subdivisions",
+    "surveyPercentages",
+    "approvalPercentages",
+    "totalSurveyors",
+    "inField",
+    "dailyProgress",
+)
+
+# Every region of index.html that update_html rewrites, as (group, pattern,
+# error raised if the region is missing). Only the first match of each group
+# is replaced; optional regions are left alone when absent.
+_HTML_EDITS = (
+    ("as_of", r"<p>Ludhiana District \| Data as of [^<]+</p>", None),
+    (
+        "stats",
+        r'    <div class="stats-grid">.*?(?=\r?\n\r?\n    <h2 style="margin: 30px 0 20px 0; padding-left: 10px;">)',
+        "Could not find stats grid in HTML.",
+    ),
+    (
+        "cards",
+        r'    <div class="subdivision-grid">.*?(?=\r?\n\r?\n    <!-- Charts: survey, approval, surveyors, daily progress -->)',
+        "Could not find subdivision grid in HTML.",
+    ),
+    ("surveyed_th", r"<th>Surveyed \([^)]+\)</th>", None),
+    ("tbody", r"            <tbody>.*?            </tbody>", "Could not find <tbody> in table."),
+    *(
+        (f"js_{name}", rf"const {re.escape(name)} = \[[^\]]*\];", f"JS array constant not found: {name}")
+        for name in _JS_ARRAY_CONSTS
+    ),
+    ("daily_label", r"label: 'Plots Surveyed \([^']+\)'", None),
+)
+
+# Compiled as a bytes pattern so index.html can be edited without decoding it.
+_HTML_EDIT_RE = re.compile(
+    "|".join(f"(?P<{group}>{pattern})" for group, pattern, _ in _HTML_EDITS).encode("utf-8"),
+    re.DOTALL,
+)
+
+
+def apply_html_edits(html: bytes | mmap.mmap, replacements: dict[str, str]) -> list[bytes | memoryview]:
+    """Rewrite the regions named in ``_HTML_EDITS`` in a single scan of ``html``.
+
+    Returns the UTF-8 output as a list of chunks to be joined or written out.
+    Unchanged spans are zero-copy views into ``html``; replacements follow the
+    file's line endings (CRLF on Windows checkouts).
+    """
+    pending = dict(replacements)
+    spans: list[tuple[int, int, str]] = []
+    for match in _HTML_EDIT_RE.finditer(html):
+        replacement = pending.pop(match.lastgroup, None)
+        if replacement is not None:
+            spans.append((match.start(), match.end(), replacement))
+
+    for group, _, error in _HTML_EDITS:
+        if group in pending and error is not None:
+            raise ValueError(error)
+
+    # Views are only taken once the scan has succeeded, so an error above never
+    # leaves a live export on a memory-mapped ``html``.
+    crlf = html.find(b"\r\n") != -1
+    view = memoryview(html)
+    parts: list[bytes | memoryview] = []
+    pos = 0
+    for start, end, replacement in spans:
+        parts.append(view[pos:start])
+        if crlf:
+            replacement = replacement.replace("\n", "\r\n")
+        parts.append(replacement.encode("utf-8"))
+        pos = end
+    parts.append(view[pos:])
+    view.release()
+    return parts
+
+
+def build_html_replacements(data: dict[str, Any]) -> dict[str, str]:
+    """Render the new content for every ``_HTML_EDITS`` region from parsed Excel data."""
     report_date = data["report_date"]
     as_of = format_as_of_date(report_date)
     surveyed_header = format_surveyed_header_date(report_date)
@@ -474,69 +616,70 @@ def update_html(index_path: Path, data: dict[str, Any]) -> None:
     rows = data["subdivisions"]
     totals = data["totals"]
 
-    stats_html = build_stats_html(totals)
-    cards_html = build_subdivision_cards_html(rows)
-    tbody_html = build_table_body_html(rows, totals)
-
-    html = re.sub(
-        r"<p>Ludhiana District \| Data as of [^<]+</p>",
-        f"<p>Ludhiana District | Data as of {as_of}</p>",
-        html,
-        count=1,
-    )
-
-    html = replace_between(
-        html,
-        '    <div class="stats-grid">',
-        '\n\n    <h2 style="margin: 30px 0 20px 0; padding-left: 10px;">',
-        stats_html,
-    )
-
-    html = replace_between(
-        html,
-        '    <div class="subdivision-grid">',
-        '\n\n    <!-- Charts: survey, approval, surveyors, daily progress -->',
-        cards_html,
-    )
+    # Format every chart series in one pass over the rows.
+    names: list[str] = []
+    survey_pcts: list[str] = []
+    approval_pcts: list[str] = []
+    total_surveyors: list[str] = []
+    in_field: list[str] = []
+    daily_progress: list[str] = []
+    for row in rows:
+        names.append(f"'{row['name']}'")
+        survey_pcts.append(f'{row["survey_percent"]:.2f}')
+        approval_pcts.append(f'{row["approval_percent"]:.2f}')
+        total_surveyors.append(str(row["total_surveyors"]))
+        in_field.append(str(row["in_field"]))
+        daily_progress.append(str(row["surveyed_today"]))
+
+    js_arrays = {
+        "subdivisions": names,
+        "surveyPercentages": survey_pcts,
+        "approvalPercentages": approval_pcts,
+        "totalSurveyors": total_surveyors,
+        "inField": in_field,
+        "dailyProgress": daily_progress,
+    }
 
-    html = re.sub(
-        r"<th>Surveyed \([^)]+\)</th>",
-        f"<th>Surveyed ({surveyed_header})</th>",
-        html,
-        count=1,
-    )
+    replacements = {
+        "as_of": f"<p>Ludhiana District | Data as of {as_of}</p>",
+        "stats": build_stats_html(totals),
+        "cards": build_subdivision_cards_html(rows),
+        "surveyed_th": f"<th>Surveyed ({surveyed_header})</th>",
+        "tbody": build_table_body_html(rows, totals),
+        "daily_label": f"label: 'Plots Surveyed ({daily_label})'",
+    }
+    for name, values in js_arrays.items():
+        replacements[f"js_{name}"] = f"const {name} = [{', '.join(values)}];"
+    return replacements
 
-    tbody_start = html.find("            <tbody>")
-    if tbody_start == -1:
-        raise ValueError("Could not find <tbody> in table.")
-    tbody_end = html.find("            </tbody>", tbody_start)
-    if tbody_end == -1:
-        raise ValueError("Could not find </tbody> in table.")
-    tbody_end += len("            </tbody>")
-    html = html[:tbody_start] + tbody_html + html[tbody_end:]
-
-    subdivisions = [row["name"] for row in rows]
-    survey_pcts = [f'{row["survey_percent"]:.2f}' for row in rows]
-    approval_pcts = [f'{row["approval_percent"]:.2f}' for row in rows]
-    total_surveyors = [str(row["total_surveyors"]) for row in rows]
-    in_field = [str(row["in_field"]) for row in rows]
-    daily_progress = [str(row["surveyed_today"]) for row in rows]
-
-    html = replace_array_const(html, "subdivisions", ", ".join(f"'{name}'" for name in subdivisions))
-    html = replace_array_const(html, "surveyPercentages", ", ".join(survey_pcts))
-    html = replace_array_const(html, "approvalPercentages", ", ".join(approval_pcts))
-    html = replace_array_const(html, "totalSurveyors", ", ".join(total_surveyors))
-    html = replace_array_const(html, "inField", ", ".join(in_field))
-    html = replace_array_const(html, "dailyProgress", ", ".join(daily_progress))
-
-    html = re.sub(
-        r"label: 'Plots Surveyed \([^']+\)'",
-        f"label: 'Plots Surveyed ({daily_label})'",
-        html,
-        count=1,
-    )
 
-    index_path.write_text(html, encoding="utf-8")
+def update_html(index_path: Path, data: dict[str, Any]) -> None:
+    replacements = build_html_replacements(data)
+    # Scan the page straight from a read-only mapping and write the result to a
+    # sibling file; it replaces the page only once the mapping is closed. The
+    # path is resolved so a symlinked page updates its target, not the link.
+    target = index_path.resolve()
+    tmp_path = target.with_name(target.name + ".tmp")
+    try:
+        with target.open("rb") as src:
+            # mmap refuses empty files; those just fail the region checks.
+            if os.fstat(src.fileno()).st_size:
+                mapping = mmap.mmap(src.fileno(), 0, access=mmap.ACCESS_READ)
+            else:
+                mapping = nullcontext(b"")
+            with mapping as html:
+                chunks = apply_html_edits(html, replacements)
+                try:
+                    with tmp_path.open("wb") as f:
+                        f.writelines(chunks)
+                finally:
+                    for chunk in chunks:
+                        if isinstance(chunk, memoryview):
+                            chunk.release()
+        shutil.copymode(target, tmp_path)
+        os.replace(tmp_path, target)
+    finally:
+        tmp_path.unlink(missing_ok=True)
 
 
 def main() -> None: